@@ -0,0 +1,26 @@
+"""Shared request dependencies."""
+
+import secrets
+from typing import Optional
+
+from fastapi import Header, Request
+
+from ..core.config import get_settings
+
+
+def get_tenant_id(
+    request: Request,
+    x_api_key: Optional[str] = Header(default=None, description="调用方 API Key，用于区分租户"),
+) -> str:
+    """识别请求所属租户.
+
+    只有在 tenant_api_keys 中登记过的 API Key 才能指定租户；其余请求一律按来源地址归类，
+    避免调用方通过伪造或轮换请求头把自己拆成多个租户来绕过公平排队与并发上限。
+    """
+    api_key = (x_api_key or "").strip()
+    if api_key:
+        for known_key, tenant in get_settings().tenant_api_keys.items():
+            if secrets.compare_digest(api_key.encode("utf-8"), known_key.encode("utf-8")):
+                return f"tenant:{tenant}"
+    host = request.client.host if request.client else "anonymous"
+    return f"addr:{host}"
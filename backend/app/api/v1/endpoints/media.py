@@ -1,11 +1,15 @@
 """素材上传与处理接口。"""
 
+from functools import partial
 from typing import Optional
 
-from fastapi import APIRouter, File, Form, HTTPException, UploadFile
+from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile
 
+from ...deps import get_tenant_id
+from ....schemas.job import RenderPriority
 from ....schemas.media import MediaProcessingMode, MediaUploadResponse
 from ....services.comfyui import ComfyUIClient, ComfyUIError
+from ....services.scheduler import RenderQueueError, get_render_scheduler
 from ....services.storage import StorageService
 from ....utils.identifiers import new_job_id
 
@@ -31,19 +35,43 @@ async def upload_media(
         default=None,
         description="【文本输入】素材说明或期望效果",
     ),
+    priority: RenderPriority = Form(
+        default=RenderPriority.batch,
+        description="ComfyUI 渲染优先级：默认 batch 批量任务，交互预览需显式指定 interactive",
+    ),
+    tenant_id: str = Depends(get_tenant_id),
 ) -> MediaUploadResponse:
     """保存上传的媒体文件，并在需要时触发 ComfyUI 处理。"""
     job_id, path = storage_service.persist_upload(file, job_id=new_job_id("media"))
 
     comfy_status = None
+    queue_position = None
+    queue_wait_seconds = None
     if mode == MediaProcessingMode.comfy:
         try:
-            comfy_status = await comfy_client.submit_workflow(
-                payload={"prompt": {"file_path": str(path), "notes": notes}},
-                endpoint_override=comfyui_endpoint,
-            )
+            base_url = comfy_client.resolve_base_url(comfyui_endpoint)
+            async with get_render_scheduler(base_url).reserve(tenant_id, priority) as ticket:
+                queue_position = ticket.queue_position
+                queue_wait_seconds = round(ticket.wait_seconds, 3)
+                comfy_status = await comfy_client.submit_workflow(
+                    payload={"prompt": {"file_path": str(path), "notes": notes}},
+                    endpoint_override=base_url,
+                )
+                if comfy_status.get("prompt_id"):
+                    ticket.hold_until(
+                        partial(
+                            comfy_client.wait_for_completion,
+                            comfy_status["prompt_id"],
+                            endpoint_override=base_url,
+                        )
+                    )
         except ComfyUIError as exc:
             raise HTTPException(status_code=exc.status_code, detail=str(exc)) from exc
+        except RenderQueueError as exc:
+            raise HTTPException(
+                status_code=exc.status_code,
+                detail={"message": str(exc), "queue_position": exc.queue_position},
+            ) from exc
 
     detail = "Stored for direct processing" if mode == MediaProcessingMode.direct else "Forwarded to ComfyUI"
     response = MediaUploadResponse(
@@ -52,6 +80,8 @@ async def upload_media(
         mode=mode,
         comfyui_endpoint=comfyui_endpoint,
         detail=detail,
+        queue_position=queue_position,
+        queue_wait_seconds=queue_wait_seconds,
     )
 
     if comfy_status:
@@ -1,10 +1,14 @@
 """提示词生成接口。"""
 
-from fastapi import APIRouter, HTTPException, status
+from functools import partial
 
+from fastapi import APIRouter, Depends, HTTPException, status
+
+from ...deps import get_tenant_id
 from ....schemas.prompt import PromptResponse, SubmissionTarget, TextPromptRequest
 from ....services.comfyui import ComfyUIClient, ComfyUIError
 from ....services.llm import LLMProvider, ProviderError
+from ....services.scheduler import RenderQueueError, get_render_scheduler
 
 router = APIRouter()
 
@@ -13,7 +17,10 @@ comfy_client = ComfyUIClient()
 
 
 @router.post("/prompts/text", response_model=PromptResponse, summary="文本生成提示词")
-async def generate_prompt_from_text(payload: TextPromptRequest) -> PromptResponse:
+async def generate_prompt_from_text(
+    payload: TextPromptRequest,
+    tenant_id: str = Depends(get_tenant_id),
+) -> PromptResponse:
     """根据文字输入生成结构化视频提示词。"""
     try:
         prompt_response = await llm_provider.generate_prompt(payload)
@@ -21,14 +28,32 @@ async def generate_prompt_from_text(payload: TextPromptRequest) -> PromptRespons
         raise HTTPException(status_code=exc.status_code, detail=str(exc)) from exc
 
     if payload.submit_to in (SubmissionTarget.comfyui, SubmissionTarget.both):
+        workflow_payload = build_workflow_payload(prompt_response.prompt)
         try:
-            comfy_response = await comfy_client.submit_workflow(
-                payload=build_workflow_payload(prompt_response.prompt),
-                endpoint_override=payload.comfyui_endpoint,
-            )
+            base_url = comfy_client.resolve_base_url(payload.comfyui_endpoint)
+            async with get_render_scheduler(base_url).reserve(tenant_id, payload.priority) as ticket:
+                prompt_response.queue_position = ticket.queue_position
+                prompt_response.queue_wait_seconds = round(ticket.wait_seconds, 3)
+                comfy_response = await comfy_client.submit_workflow(
+                    payload=workflow_payload,
+                    endpoint_override=base_url,
+                )
+                if comfy_response.get("prompt_id"):
+                    ticket.hold_until(
+                        partial(
+                            comfy_client.wait_for_completion,
+                            comfy_response["prompt_id"],
+                            endpoint_override=base_url,
+                        )
+                    )
             prompt_response.metadata["comfyui_submission"] = comfy_response
         except ComfyUIError as exc:
             raise HTTPException(status_code=exc.status_code, detail=str(exc)) from exc
+        except RenderQueueError as exc:
+            raise HTTPException(
+                status_code=exc.status_code,
+                detail={"message": str(exc), "queue_position": exc.queue_position},
+            ) from exc
 
     if payload.submit_to in (SubmissionTarget.llm, SubmissionTarget.both):
         prompt_response.metadata.setdefault("llm_submission", {"status": "submitted"})
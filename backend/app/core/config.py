@@ -1,7 +1,8 @@
 """Application configuration powered by environment variables."""
 
+import logging
 from functools import lru_cache
-from typing import Any, List, Optional
+from typing import Any, Dict, List, Optional
 
 from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -15,9 +16,67 @@ class AppSettings(BaseSettings):
     debug: bool = Field(default=False, description="Enable debug mode")
     cors_origins: List[str] = Field(default_factory=lambda: ["*"], description="Allowed CORS origins")
 
+    log_level: str = Field(default="INFO", description="Root log level")
+    log_json: bool = Field(default=True, description="Emit structured JSON log lines instead of plain text")
+    trace_sample_rate: float = Field(
+        default=0.0,
+        ge=0.0,
+        le=1.0,
+        description="Fraction of requests that record per-stage timing spans",
+    )
+
     storage_dir: str = Field(default="storage", description="Local directory for temporary file storage")
 
     comfyui_base_url: Optional[str] = Field(default=None, description="Base URL for ComfyUI server (optional fallback)")
+    tenant_api_keys: Dict[str, str] = Field(
+        default_factory=dict,
+        description="Known API keys mapped to tenant names for render fair-share scheduling",
+    )
+    render_max_in_flight: int = Field(
+        default=4,
+        ge=1,
+        description="Maximum ComfyUI renders queued or running at once across all tenants",
+    )
+    render_tenant_max_in_flight: int = Field(
+        default=2,
+        ge=1,
+        description="Maximum ComfyUI renders queued or running at once per tenant",
+    )
+    render_interactive_weight: float = Field(
+        default=4.0,
+        gt=0,
+        description="Fair-queuing weight of interactive render submissions",
+    )
+    render_batch_weight: float = Field(
+        default=1.0,
+        gt=0,
+        description="Fair-queuing weight of batch render submissions",
+    )
+    render_max_queue_wait: float = Field(
+        default=30.0,
+        gt=0,
+        description="Seconds a request may wait for a render slot before it is rejected with 503",
+    )
+    render_tenant_max_queued: int = Field(
+        default=10,
+        ge=1,
+        description="Maximum render requests one tenant may have waiting for a slot; more are rejected with 429",
+    )
+    render_poll_interval: float = Field(
+        default=2.0,
+        gt=0,
+        description="Seconds between ComfyUI history polls while waiting for a render to finish",
+    )
+    render_completion_timeout: float = Field(
+        default=900.0,
+        gt=0,
+        description="Seconds after which an unfinished render releases its scheduler slot",
+    )
+    render_poll_max_failures: int = Field(
+        default=3,
+        ge=1,
+        description="Consecutive failed ComfyUI polls after which a render releases its scheduler slot",
+    )
     dashscope_api_key: Optional[str] = Field(default=None, description="API key for DashScope/Tongyi-Qianwen")
     dashscope_base_url: str = Field(
         default="https://dashscope.aliyuncs.com/compatible-mode/v1",
@@ -54,6 +113,15 @@ class AppSettings(BaseSettings):
             return [origin.strip() for origin in value.split(",") if origin.strip()]
         return value
 
+    @field_validator("log_level")
+    @classmethod
+    def validate_log_level(cls, value: str) -> str:
+        """统一为大写，并拒绝 logging 不认识的级别名."""
+        normalized = value.strip().upper()
+        if not isinstance(logging.getLevelName(normalized), int):
+            raise ValueError(f"Unknown log level: {value}")
+        return normalized
+
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8", extra="ignore")
 
 
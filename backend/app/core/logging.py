@@ -1,12 +1,104 @@
 """Centralised logging configuration."""
 
+import atexit
+import copy
+import json
 import logging
+import queue
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
 from typing import Optional
 
+from .config import get_settings
+from .tracing import get_request_id
+
+TEXT_FORMAT = "%(asctime)s - %(levelname)s - %(name)s - %(request_id)s - %(message)s"
+
+_SPAN_FIELDS = ("span", "duration_ms", "span_status", "span_attributes")
+
+# Uvicorn attaches its own synchronous stream handlers to these loggers.
+UVICORN_LOGGERS = ("uvicorn", "uvicorn.error", "uvicorn.access")
+
+_listener: Optional[QueueListener] = None
+
+
+class JsonFormatter(logging.Formatter):
+    """Render records as one JSON object per line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "timestamp": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", None),
+        }
+        for field in _SPAN_FIELDS:
+            if hasattr(record, field):
+                payload[field] = getattr(record, field)
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class ContextQueueHandler(QueueHandler):
+    """Queue handler that stamps records with the current correlation id.
+
+    Preparation runs in the logging caller's context, before the record crosses
+    to the listener thread where the context variable is no longer visible.
+    Exception info is kept so the output formatter can render it.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        record.request_id = get_request_id() or "-"
+        return record
+
 
 def configure_logging(level: Optional[int] = None) -> None:
-    """Configure root logger with a concise formatter."""
-    logging.basicConfig(
-        level=level or logging.INFO,
-        format="%(asctime)s - %(levelname)s - %(name)s - %(message)s",
-    )
+    """Route root and uvicorn logging through a queue so handler I/O runs off the event loop."""
+    global _listener
+
+    settings = get_settings()
+    shutdown_logging()
+
+    output = logging.StreamHandler()
+    output.setFormatter(JsonFormatter() if settings.log_json else logging.Formatter(TEXT_FORMAT, defaults={"request_id": "-"}))
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    _set_root_handlers(ContextQueueHandler(log_queue))
+    logging.getLogger().setLevel(level or settings.log_level)
+
+    for name in UVICORN_LOGGERS:
+        uvicorn_logger = logging.getLogger(name)
+        for handler in uvicorn_logger.handlers[:]:
+            uvicorn_logger.removeHandler(handler)
+        uvicorn_logger.propagate = True
+
+    _listener = QueueListener(log_queue, output, respect_handler_level=True)
+    _listener.start()
+
+
+def shutdown_logging() -> None:
+    """Flush queued records, stop the listener thread and log directly from then on."""
+    global _listener
+
+    if _listener is None:
+        return
+    _listener.stop()
+    # Nothing drains the queue any more, so records must not keep landing in it.
+    _set_root_handlers(*_listener.handlers)
+    _listener = None
+
+
+def _set_root_handlers(*handlers: logging.Handler) -> None:
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    for handler in handlers:
+        root.addHandler(handler)
+
+
+atexit.register(shutdown_logging)
@@ -0,0 +1,164 @@
+"""Request correlation ids and sampled stage timing spans."""
+
+from __future__ import annotations
+
+import logging
+import random
+import re
+import time
+from contextvars import ContextVar
+from typing import Any, Dict, Optional
+
+from fastapi import FastAPI
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ..utils.identifiers import new_job_id
+from .config import get_settings
+
+REQUEST_ID_HEADER = "X-Request-ID"
+_REQUEST_ID_HEADER_KEY = REQUEST_ID_HEADER.lower().encode("latin-1")
+
+# Client-supplied ids end up in every log line and outbound header, so keep them short and plain.
+_VALID_REQUEST_ID = re.compile(r"[A-Za-z0-9._:-]{1,64}")
+
+logger = logging.getLogger("app.trace")
+
+_request_id: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+_sampled: ContextVar[bool] = ContextVar("trace_sampled", default=False)
+
+
+def get_request_id() -> Optional[str]:
+    """Return the correlation id of the request being handled, if any."""
+    return _request_id.get()
+
+
+def is_sampled() -> bool:
+    """Return whether spans are recorded for the current request."""
+    return _sampled.get()
+
+
+class Span:
+    """Times one processing stage and logs it on exit."""
+
+    __slots__ = ("name", "attributes", "_started")
+
+    def __init__(self, name: str, attributes: Dict[str, Any]) -> None:
+        self.name = name
+        self.attributes = attributes
+        self._started = 0.0
+
+    def set(self, **attributes: Any) -> None:
+        """Attach extra attributes discovered while the stage runs."""
+        self.attributes.update(attributes)
+
+    def __enter__(self) -> "Span":
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        duration_ms = (time.perf_counter() - self._started) * 1000
+        logger.info(
+            "span %s finished in %.1f ms",
+            self.name,
+            duration_ms,
+            extra={
+                "span": self.name,
+                "duration_ms": round(duration_ms, 3),
+                "span_status": "error" if exc_type else "ok",
+                "span_attributes": self.attributes,
+            },
+        )
+
+
+class _NullSpan:
+    """Shared no-op span used when the request is not sampled."""
+
+    __slots__ = ()
+
+    def set(self, **attributes: Any) -> None:
+        pass
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def span(name: str, **attributes: Any) -> Span | _NullSpan:
+    """Return a timing span for ``name``; a shared no-op when tracing is off.
+
+    Spans are logged at INFO, so they are skipped as well when that level is disabled.
+    """
+    if not _sampled.get() or not logger.isEnabledFor(logging.INFO):
+        return _NULL_SPAN
+    return Span(name, attributes)
+
+
+def _resolve_request_id(candidate: Optional[str]) -> str:
+    if candidate and _VALID_REQUEST_ID.fullmatch(candidate):
+        return candidate
+    return new_job_id("req")
+
+
+def _should_sample(rate: float) -> bool:
+    if rate <= 0:
+        return False
+    if rate >= 1:
+        return True
+    return random.random() < rate
+
+
+class RequestTracingMiddleware:
+    """Plain ASGI middleware that tags each request with a correlation id.
+
+    Unsampled requests only pay for two context variable updates and the
+    response header; the request span is opened for sampled requests alone.
+    """
+
+    def __init__(self, app: ASGIApp, sample_rate: float) -> None:
+        self.app = app
+        self.sample_rate = sample_rate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = _resolve_request_id(_header_value(scope, _REQUEST_ID_HEADER_KEY))
+        request_span = None
+
+        async def send_with_request_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append(REQUEST_ID_HEADER, request_id)
+                if request_span is not None:
+                    request_span.set(status_code=message["status"])
+            await send(message)
+
+        id_token = _request_id.set(request_id)
+        sampled_token = _sampled.set(_should_sample(self.sample_rate))
+        try:
+            if _sampled.get():
+                with span("http.request", method=scope["method"], path=scope["path"]) as request_span:
+                    await self.app(scope, receive, send_with_request_id)
+            else:
+                await self.app(scope, receive, send_with_request_id)
+        finally:
+            _sampled.reset(sampled_token)
+            _request_id.reset(id_token)
+
+
+def _header_value(scope: Scope, name: bytes) -> Optional[str]:
+    for key, value in scope["headers"]:
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+
+def setup_tracing(app: FastAPI) -> None:
+    """Assign a correlation id to every request and sample it for tracing."""
+    app.add_middleware(RequestTracingMiddleware, sample_rate=get_settings().trace_sample_rate)
@@ -7,7 +7,8 @@ from fastapi import FastAPI
 from .api.v1.router import api_router
 from .core.config import get_settings
 from .core.cors import setup_cors
-from .core.logging import configure_logging
+from .core.logging import configure_logging, shutdown_logging
+from .core.tracing import setup_tracing
 
 settings = get_settings()
 
@@ -21,6 +22,7 @@ app = FastAPI(
 )
 
 setup_cors(app)
+setup_tracing(app)
 
 app.include_router(api_router, prefix=settings.api_v1_prefix)
 
@@ -29,3 +31,9 @@ app.include_router(api_router, prefix=settings.api_v1_prefix)
 async def ensure_storage_directory() -> None:
     """Create storage directory for temporary assets."""
     Path(settings.storage_dir).mkdir(parents=True, exist_ok=True)
+
+
+@app.on_event("shutdown")
+async def flush_logs() -> None:
+    """Drain queued log records before exit."""
+    shutdown_logging()
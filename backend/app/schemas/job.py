@@ -16,6 +16,13 @@ class JobStatus(str, Enum):
     failed = "failed"
 
 
+class RenderPriority(str, Enum):
+    """Priority classes for render submissions."""
+
+    interactive = "interactive"
+    batch = "batch"
+
+
 class JobInfo(BaseModel):
     """Job metadata shared with clients."""
 
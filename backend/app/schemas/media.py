@@ -21,3 +21,11 @@ class MediaUploadResponse(BaseModel):
     mode: MediaProcessingMode = Field(default=MediaProcessingMode.direct)
     comfyui_endpoint: Optional[str] = Field(default=None, description="ComfyUI endpoint used for this job")
     detail: str = Field(default="Stored", description="Additional status detail")
+    queue_position: Optional[int] = Field(
+        default=None,
+        description="Render jobs ahead of this one when it was queued for ComfyUI (0 = next in line)",
+    )
+    queue_wait_seconds: Optional[float] = Field(
+        default=None,
+        description="Seconds spent waiting for a render slot before submitting to ComfyUI",
+    )
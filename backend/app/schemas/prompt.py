@@ -5,6 +5,8 @@ from typing import Any, Dict, Optional
 
 from pydantic import BaseModel, Field
 
+from .job import RenderPriority
+
 
 class SubmissionTarget(str, Enum):
     """Available downstream systems for prompts."""
@@ -33,6 +35,10 @@ class TextPromptRequest(BaseModel):
     comfyui_endpoint: Optional[str] = Field(
         default=None, description="【文本输入】本次请求使用的 ComfyUI 服务器地址"
     )
+    priority: RenderPriority = Field(
+        default=RenderPriority.batch,
+        description="Render priority class used when submitting to ComfyUI; interactive previews must opt in",
+    )
 
 
 class PromptResponse(BaseModel):
@@ -40,3 +46,11 @@ class PromptResponse(BaseModel):
 
     prompt: str
     metadata: Dict[str, Any] = Field(default_factory=dict)
+    queue_position: Optional[int] = Field(
+        default=None,
+        description="Render jobs ahead of this one when it was queued for ComfyUI (0 = next in line)",
+    )
+    queue_wait_seconds: Optional[float] = Field(
+        default=None,
+        description="Seconds spent waiting for a render slot before submitting to ComfyUI",
+    )
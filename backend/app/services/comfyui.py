@@ -2,12 +2,15 @@
 
 from __future__ import annotations
 
+import asyncio
+import time
 from typing import Any, Dict, Optional
 
 import httpx
 from fastapi import status
 
 from ..core.config import AppSettings, get_settings
+from ..core.tracing import REQUEST_ID_HEADER, get_request_id, span
 
 
 class ComfyUIError(Exception):
@@ -21,8 +24,13 @@ class ComfyUIError(Exception):
 class ComfyUIClient:
     """与 ComfyUI 服务器交互的简单封装."""
 
-    def __init__(self, settings: Optional[AppSettings] = None) -> None:
+    def __init__(
+        self,
+        settings: Optional[AppSettings] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ) -> None:
         self.settings = settings or get_settings()
+        self.transport = transport
 
     async def submit_workflow(
         self,
@@ -34,14 +42,89 @@ class ComfyUIClient:
         ComfyUI 服务器地址会经常变化，因此优先使用 endpoint_override。
         如果未提供 override，则尝试使用配置中的 comfyui_base_url。
         """
+        base_url = self.resolve_base_url(endpoint_override)
+
+        request_id = get_request_id()
+        headers = {REQUEST_ID_HEADER: request_id} if request_id else None
+
+        with span("comfyui.submit", endpoint=base_url) as submit_span:
+            async with httpx.AsyncClient(base_url=base_url, timeout=120, transport=self.transport) as client:
+                response = await client.post("/prompt", json=payload, headers=headers)
+                submit_span.set(status_code=response.status_code)
+                try:
+                    response.raise_for_status()
+                except httpx.HTTPStatusError as exc:  # pragma: no cover - network
+                    raise ComfyUIError(f"ComfyUI 调用失败：{exc.response.text}") from exc
+        return response.json()
+
+    async def wait_for_completion(
+        self,
+        prompt_id: str,
+        endpoint_override: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """轮询 ComfyUI，直到该任务执行结束或已不可能结束。
+
+        /history/{prompt_id} 在任务完成前返回空对象，完成后返回以 prompt_id 为键的执行记录。
+        任务既不在历史也不在 /queue 中（被删除或 ComfyUI 已重启）、返回 404、
+        连续 render_poll_max_failures 次无法访问，或超过 render_completion_timeout 时抛出 ComfyUIError。
+        """
+        base_url = self.resolve_base_url(endpoint_override)
+        deadline = time.monotonic() + self.settings.render_completion_timeout
+        failures = 0
+
+        async with httpx.AsyncClient(base_url=base_url, timeout=30, transport=self.transport) as client:
+            while True:
+                try:
+                    record = await self._history_record(client, prompt_id)
+                    if record is not None:
+                        return record
+                    if not await self._is_queued(client, prompt_id):
+                        # 任务可能恰好在两次请求之间完成，再确认一次历史记录
+                        record = await self._history_record(client, prompt_id)
+                        if record is not None:
+                            return record
+                        raise ComfyUIError(f"ComfyUI 队列中已不存在任务 {prompt_id}。")
+                    failures = 0
+                except httpx.HTTPStatusError as exc:
+                    if exc.response.status_code == status.HTTP_404_NOT_FOUND:
+                        raise ComfyUIError(f"ComfyUI 无法查询任务 {prompt_id}：{exc.response.text}") from exc
+                    failures += 1
+                except (httpx.HTTPError, ValueError):
+                    failures += 1
+
+                if failures >= self.settings.render_poll_max_failures:
+                    raise ComfyUIError(f"连续 {failures} 次无法访问 ComfyUI，停止等待任务 {prompt_id}。")
+                if time.monotonic() >= deadline:
+                    raise ComfyUIError(
+                        f"等待 ComfyUI 任务 {prompt_id} 完成超时。", status.HTTP_504_GATEWAY_TIMEOUT
+                    )
+                await asyncio.sleep(self.settings.render_poll_interval)
+
+    @staticmethod
+    async def _history_record(client: httpx.AsyncClient, prompt_id: str) -> Optional[Dict[str, Any]]:
+        response = await client.get(f"/history/{prompt_id}")
+        response.raise_for_status()
+        history = response.json()
+        if not isinstance(history, dict):
+            raise ValueError("ComfyUI /history 返回格式异常")
+        return history.get(prompt_id)
+
+    @staticmethod
+    async def _is_queued(client: httpx.AsyncClient, prompt_id: str) -> bool:
+        response = await client.get("/queue")
+        response.raise_for_status()
+        queue = response.json()
+        if not isinstance(queue, dict):
+            raise ValueError("ComfyUI /queue 返回格式异常")
+        # 队列项格式为 [序号, prompt_id, prompt, extra_data, outputs]
+        return any(
+            len(item) > 1 and item[1] == prompt_id
+            for item in queue.get("queue_running", []) + queue.get("queue_pending", [])
+        )
+
+    def resolve_base_url(self, endpoint_override: Optional[str]) -> str:
+        """返回本次请求实际使用的 ComfyUI 地址，优先使用 endpoint_override."""
         base_url = (endpoint_override or "").strip() or (self.settings.comfyui_base_url or "").strip()
         if not base_url:
             raise ComfyUIError("未提供 ComfyUI 服务器地址，请在请求中填写。", status.HTTP_400_BAD_REQUEST)
-
-        async with httpx.AsyncClient(base_url=base_url, timeout=120) as client:
-            response = await client.post("/prompt", json=payload)
-            try:
-                response.raise_for_status()
-            except httpx.HTTPStatusError as exc:  # pragma: no cover - network
-                raise ComfyUIError(f"ComfyUI 调用失败：{exc.response.text}") from exc
-        return response.json()
+        return base_url
@@ -10,6 +10,7 @@ import httpx
 from fastapi import status
 
 from ..core.config import AppSettings, get_settings
+from ..core.tracing import span
 from ..schemas.prompt import PromptResponse, TextPromptRequest
 
 
@@ -189,7 +190,9 @@ class LLMProvider:
         if not client:
             raise ProviderError(f"暂不支持的模型提供商：{provider_key}", status_code=status.HTTP_400_BAD_REQUEST)
 
-        provider_response = await client.generate_prompt(request)
+        with span("llm.provider_call", provider=provider_key) as provider_span:
+            provider_response = await client.generate_prompt(request)
+            provider_span.set(model=provider_response.metadata.get("model"))
         metadata = provider_response.metadata
         if request.reference_style:
             metadata["reference_style"] = request.reference_style
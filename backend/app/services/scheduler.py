@@ -0,0 +1,296 @@
+"""Fair-share scheduling of ComfyUI renders."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, Mapping, Optional, Set, Tuple
+
+from fastapi import status
+
+from ..core.config import get_settings
+from ..schemas.job import RenderPriority
+
+FlowKey = Tuple[str, RenderPriority]
+
+logger = logging.getLogger(__name__)
+
+
+class RenderQueueError(Exception):
+    """Raised when a render request cannot be queued or waits too long for a slot."""
+
+    def __init__(self, message: str, *, status_code: int, queue_position: int) -> None:
+        super().__init__(message)
+        self.status_code = status_code
+        self.queue_position = queue_position
+
+
+@dataclass
+class RenderTicket:
+    """一次渲染提交的排队信息."""
+
+    tenant_id: str
+    priority: RenderPriority
+    queue_position: int
+    wait_seconds: float = 0.0
+    completion: Optional[Callable[[], Awaitable[Any]]] = field(default=None, repr=False)
+
+    def hold_until(self, completion: Callable[[], Awaitable[Any]]) -> None:
+        """在 completion 返回的协程结束后才释放名额，而不是在退出上下文时释放."""
+        self.completion = completion
+
+
+@dataclass
+class _PendingRender:
+    start_tag: float
+    finish_tag: float
+    sequence: int
+    tenant_id: str
+    priority: RenderPriority
+    grant: asyncio.Future = field(repr=False)
+
+    @property
+    def sort_key(self) -> Tuple[float, int]:
+        return self.finish_tag, self.sequence
+
+
+class RenderScheduler:
+    """按租户加权公平排队的渲染调度器.
+
+    每个 (租户, 优先级) 组合是一条独立队列，按启动时间公平排队（SFQ）分配虚拟完成时间：
+    同一优先级的租户轮流获得名额，优先级之间按权重比例分配，因此批量任务不会饿死，
+    单个租户也无法凭借大量提交占满整个渲染集群。
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int,
+        tenant_max_in_flight: int,
+        weights: Mapping[RenderPriority, float],
+        max_queue_wait: Optional[float] = None,
+        tenant_max_queued: Optional[int] = None,
+    ) -> None:
+        self.max_in_flight = max_in_flight
+        self.tenant_max_in_flight = tenant_max_in_flight
+        self.weights = dict(weights)
+        self.max_queue_wait = max_queue_wait
+        self.tenant_max_queued = tenant_max_queued
+        self._flows: Dict[FlowKey, Deque[_PendingRender]] = {}
+        self._last_finish: Dict[FlowKey, float] = {}
+        self._tenant_in_flight: Dict[str, int] = {}
+        self._in_flight = 0
+        self._virtual_time = 0.0
+        self._sequence = 0
+        self._pending_releases: Set[asyncio.Task] = set()
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def queued(self) -> int:
+        return sum(len(flow) for flow in self._flows.values())
+
+    @property
+    def idle(self) -> bool:
+        return self._in_flight == 0 and not self._flows
+
+    @asynccontextmanager
+    async def reserve(
+        self,
+        tenant_id: str,
+        priority: RenderPriority = RenderPriority.batch,
+    ) -> AsyncIterator[RenderTicket]:
+        """等待渲染名额，退出上下文时释放.
+
+        返回的 ticket 中 queue_position 为入队时排在前面的任务数，0 表示位于队首。
+        若在上下文中调用了 ticket.hold_until，则名额由后台任务在渲染结束后释放；
+        上下文内抛出异常时总是立即释放。
+
+        租户排队数已达 tenant_max_queued 时抛出 429，等待超过 max_queue_wait 时抛出 503，
+        两者都通过 RenderQueueError 携带当前排队位置。
+        """
+        if self.tenant_max_queued is not None and self._tenant_queued(tenant_id) >= self.tenant_max_queued:
+            raise RenderQueueError(
+                "当前租户排队的渲染任务过多，请稍后重试。",
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                queue_position=self.queued,
+            )
+
+        loop = asyncio.get_running_loop()
+        entry = self._enqueue(tenant_id, priority, loop.create_future())
+        ticket = RenderTicket(
+            tenant_id=tenant_id,
+            priority=priority,
+            queue_position=self._position_of(entry),
+        )
+        self._dispatch()
+
+        enqueued_at = time.perf_counter()
+        if not entry.grant.done():
+            try:
+                # asyncio.wait 不会取消 grant，超时或被取消后由 _abandon 统一处理
+                await asyncio.wait({entry.grant}, timeout=self.max_queue_wait)
+            except asyncio.CancelledError:
+                self._abandon(entry)
+                raise
+        if not entry.grant.done():
+            position = self._position_of(entry)
+            self._abandon(entry)
+            raise RenderQueueError(
+                "等待渲染名额超时，请稍后重试。",
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                queue_position=position,
+            )
+        ticket.wait_seconds = time.perf_counter() - enqueued_at
+
+        try:
+            yield ticket
+        except BaseException:
+            self._release(tenant_id)
+            raise
+
+        if ticket.completion is None:
+            self._release(tenant_id)
+        else:
+            self._release_after(ticket)
+
+    def _release_after(self, ticket: RenderTicket) -> None:
+        async def wait_then_release() -> None:
+            try:
+                await ticket.completion()
+            except Exception:
+                logger.warning(
+                    "Render for tenant %s did not complete cleanly; releasing its slot",
+                    ticket.tenant_id,
+                    exc_info=True,
+                )
+            finally:
+                self._release(ticket.tenant_id)
+
+        task = asyncio.get_running_loop().create_task(wait_then_release())
+        # 保留引用，防止后台任务在完成前被回收
+        self._pending_releases.add(task)
+        task.add_done_callback(self._pending_releases.discard)
+
+    def _enqueue(self, tenant_id: str, priority: RenderPriority, grant: asyncio.Future) -> _PendingRender:
+        key = (tenant_id, priority)
+        start_tag = max(self._virtual_time, self._last_finish.get(key, 0.0))
+        finish_tag = start_tag + 1.0 / self.weights[priority]
+        self._last_finish[key] = finish_tag
+        self._sequence += 1
+
+        entry = _PendingRender(
+            start_tag=start_tag,
+            finish_tag=finish_tag,
+            sequence=self._sequence,
+            tenant_id=tenant_id,
+            priority=priority,
+            grant=grant,
+        )
+        self._flows.setdefault(key, deque()).append(entry)
+        return entry
+
+    def _position_of(self, entry: _PendingRender) -> int:
+        return sum(
+            1
+            for flow in self._flows.values()
+            for other in flow
+            if other.sort_key < entry.sort_key
+        )
+
+    def _tenant_queued(self, tenant_id: str) -> int:
+        return sum(len(self._flows.get((tenant_id, priority), ())) for priority in RenderPriority)
+
+    def _abandon(self, entry: _PendingRender) -> None:
+        if entry.grant.done() and not entry.grant.cancelled():
+            # 名额恰好已分配，直接归还
+            self._release(entry.tenant_id)
+        else:
+            entry.grant.cancel()
+            self._discard(entry)
+
+    def _discard(self, entry: _PendingRender) -> None:
+        key = (entry.tenant_id, entry.priority)
+        flow = self._flows.get(key)
+        if flow is None:
+            return
+        try:
+            flow.remove(entry)
+        except ValueError:
+            return
+        if not flow:
+            del self._flows[key]
+
+    def _release(self, tenant_id: str) -> None:
+        self._in_flight -= 1
+        remaining = self._tenant_in_flight[tenant_id] - 1
+        if remaining:
+            self._tenant_in_flight[tenant_id] = remaining
+        else:
+            del self._tenant_in_flight[tenant_id]
+        self._dispatch()
+        # 虚拟完成时间已落后的队列与新队列等价，清理以免租户记录无限增长
+        self._last_finish = {
+            key: finish for key, finish in self._last_finish.items() if finish > self._virtual_time
+        }
+
+    def _dispatch(self) -> None:
+        """在集群与租户并发上限内，按虚拟完成时间依次放行队首任务."""
+        while self._in_flight < self.max_in_flight:
+            candidate: Optional[_PendingRender] = None
+            for (tenant_id, _), flow in self._flows.items():
+                if self._tenant_in_flight.get(tenant_id, 0) >= self.tenant_max_in_flight:
+                    continue
+                head = flow[0]
+                if candidate is None or head.sort_key < candidate.sort_key:
+                    candidate = head
+            if candidate is None:
+                return
+
+            key = (candidate.tenant_id, candidate.priority)
+            flow = self._flows[key]
+            flow.popleft()
+            if not flow:
+                del self._flows[key]
+            if candidate.grant.done():
+                # 等待方已取消，尚未来得及从队列中移除
+                continue
+
+            self._virtual_time = max(self._virtual_time, candidate.start_tag)
+            self._in_flight += 1
+            self._tenant_in_flight[candidate.tenant_id] = self._tenant_in_flight.get(candidate.tenant_id, 0) + 1
+            candidate.grant.set_result(None)
+
+
+_schedulers: Dict[str, RenderScheduler] = {}
+
+
+def get_render_scheduler(base_url: str) -> RenderScheduler:
+    """Return the scheduler guarding the ComfyUI server at ``base_url``."""
+    key = base_url.rstrip("/")
+    scheduler = _schedulers.get(key)
+    if scheduler is None:
+        # 服务器地址由请求指定，新建时顺带清理空闲的调度器，避免映射无限增长
+        for idle_key in [other for other, candidate in _schedulers.items() if candidate.idle]:
+            del _schedulers[idle_key]
+        scheduler = _schedulers[key] = _build_scheduler()
+    return scheduler
+
+
+def _build_scheduler() -> RenderScheduler:
+    settings = get_settings()
+    return RenderScheduler(
+        max_in_flight=settings.render_max_in_flight,
+        tenant_max_in_flight=settings.render_tenant_max_in_flight,
+        max_queue_wait=settings.render_max_queue_wait,
+        tenant_max_queued=settings.render_tenant_max_queued,
+        weights={
+            RenderPriority.interactive: settings.render_interactive_weight,
+            RenderPriority.batch: settings.render_batch_weight,
+        },
+    )
@@ -9,6 +9,7 @@ from typing import Optional, Tuple
 from fastapi import UploadFile
 
 from ..core.config import AppSettings, get_settings
+from ..core.tracing import span
 from ..utils.identifiers import new_job_id
 
 
@@ -26,8 +27,10 @@ class StorageService:
 
         target_path = target_dir / upload.filename
 
-        with target_path.open("wb") as buffer:
-            shutil.copyfileobj(upload.file, buffer)
-        upload.file.close()
+        with span("storage.upload_write", job_id=job_id) as write_span:
+            with target_path.open("wb") as buffer:
+                shutil.copyfileobj(upload.file, buffer)
+                write_span.set(bytes=buffer.tell())
+            upload.file.close()
 
         return job_id, target_path
@@ -0,0 +1,75 @@
+"""Tests for ComfyUI render completion polling."""
+
+import asyncio
+import time
+from functools import partial
+
+import httpx
+import pytest
+
+from backend.app.core.config import AppSettings
+from backend.app.schemas.job import RenderPriority
+from backend.app.services.comfyui import ComfyUIClient, ComfyUIError
+from backend.app.services.scheduler import RenderScheduler
+
+BASE_URL = "http://comfy.test"
+
+
+def make_client(handler) -> ComfyUIClient:
+    settings = AppSettings(render_poll_interval=0.01, render_poll_max_failures=2, render_completion_timeout=5)
+    return ComfyUIClient(settings, transport=httpx.MockTransport(handler))
+
+
+def test_unreachable_comfyui_frees_slot_quickly() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        raise httpx.ConnectError("connection refused", request=request)
+
+    client = make_client(handler)
+
+    async def scenario() -> float:
+        scheduler = RenderScheduler(1, 1, {RenderPriority.interactive: 4.0, RenderPriority.batch: 1.0})
+        async with scheduler.reserve("a") as ticket:
+            ticket.hold_until(partial(client.wait_for_completion, "p1", endpoint_override=BASE_URL))
+        started = time.monotonic()
+        while scheduler.in_flight:
+            await asyncio.sleep(0.01)
+        return time.monotonic() - started
+
+    assert asyncio.run(scenario()) < 1
+
+
+def test_missing_history_endpoint_stops_waiting() -> None:
+    client = make_client(lambda request: httpx.Response(404, text="not found"))
+
+    with pytest.raises(ComfyUIError):
+        asyncio.run(client.wait_for_completion("p1", endpoint_override=BASE_URL))
+
+
+def test_prompt_dropped_from_queue_stops_waiting() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/queue":
+            return httpx.Response(200, json={"queue_running": [], "queue_pending": []})
+        return httpx.Response(200, json={})
+
+    client = make_client(handler)
+
+    with pytest.raises(ComfyUIError):
+        asyncio.run(client.wait_for_completion("p1", endpoint_override=BASE_URL))
+
+
+def test_completed_prompt_returns_history_record() -> None:
+    calls: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        if request.url.path == "/queue":
+            return httpx.Response(200, json={"queue_running": [[0, "p1", {}, {}, []]], "queue_pending": []})
+        if calls.count("/history/p1") < 2:
+            return httpx.Response(200, json={})
+        return httpx.Response(200, json={"p1": {"status": {"completed": True}}})
+
+    client = make_client(handler)
+
+    record = asyncio.run(client.wait_for_completion("p1", endpoint_override=BASE_URL))
+
+    assert record == {"status": {"completed": True}}
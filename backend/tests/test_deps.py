@@ -0,0 +1,23 @@
+"""Tests for tenant identification."""
+
+from starlette.requests import Request
+
+from backend.app.api import deps
+from backend.app.core.config import AppSettings
+
+
+def make_request(host: str = "10.0.0.1") -> Request:
+    return Request({"type": "http", "headers": [], "client": (host, 50000)})
+
+
+def test_registered_api_key_selects_tenant(monkeypatch) -> None:
+    monkeypatch.setattr(deps, "get_settings", lambda: AppSettings(tenant_api_keys={"secret": "studio"}))
+
+    assert deps.get_tenant_id(make_request(), x_api_key=" secret ") == "tenant:studio"
+
+
+def test_unknown_api_key_falls_back_to_remote_address(monkeypatch) -> None:
+    monkeypatch.setattr(deps, "get_settings", lambda: AppSettings(tenant_api_keys={"secret": "studio"}))
+
+    assert deps.get_tenant_id(make_request(), x_api_key="random-1") == "addr:10.0.0.1"
+    assert deps.get_tenant_id(make_request(), x_api_key="random-2") == "addr:10.0.0.1"
@@ -0,0 +1,66 @@
+"""Tests for the media upload endpoint."""
+
+import time
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.app.api.v1.endpoints import media
+from backend.app.core.config import AppSettings
+from backend.app.main import app
+from backend.app.services.comfyui import ComfyUIClient
+from backend.app.services.scheduler import get_render_scheduler
+from backend.app.services.storage import StorageService
+
+COMFYUI_URL = "http://comfy-media.test"
+
+
+@pytest.fixture
+def comfy_requests(monkeypatch, tmp_path) -> list[httpx.Request]:
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.url.path == "/prompt":
+            return httpx.Response(200, json={"prompt_id": "p1", "number": 1})
+        return httpx.Response(200, json={"p1": {"status": {"completed": True}}})
+
+    settings = AppSettings(storage_dir=str(tmp_path), render_poll_interval=0.01)
+    monkeypatch.setattr(media, "storage_service", StorageService(settings))
+    monkeypatch.setattr(media, "comfy_client", ComfyUIClient(settings, transport=httpx.MockTransport(handler)))
+    return requests
+
+
+def test_comfy_upload_reports_queue_and_releases_after_render(comfy_requests) -> None:
+    with TestClient(app) as client:
+        response = client.post(
+            "/api/v1/media/upload",
+            files={"file": ("clip.mp4", b"data", "video/mp4")},
+            data={"mode": "comfy", "priority": "interactive", "comfyui_endpoint": COMFYUI_URL},
+        )
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["queue_position"] == 0
+        assert body["queue_wait_seconds"] >= 0
+
+        scheduler = get_render_scheduler(COMFYUI_URL)
+        deadline = time.monotonic() + 2
+        while scheduler.in_flight and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert scheduler.in_flight == 0
+
+    assert [request.url.path for request in comfy_requests] == ["/prompt", "/history/p1"]
+
+
+def test_unknown_priority_is_rejected(comfy_requests) -> None:
+    with TestClient(app) as client:
+        response = client.post(
+            "/api/v1/media/upload",
+            files={"file": ("clip.mp4", b"data", "video/mp4")},
+            data={"mode": "comfy", "priority": "urgent", "comfyui_endpoint": COMFYUI_URL},
+        )
+
+    assert response.status_code == 422
+    assert comfy_requests == []
@@ -0,0 +1,214 @@
+"""Tests for fair-share render scheduling."""
+
+import asyncio
+
+from backend.app.schemas.job import RenderPriority
+from backend.app.services.scheduler import RenderQueueError, RenderScheduler, RenderTicket, get_render_scheduler
+
+
+def make_scheduler(max_in_flight: int = 1, tenant_max_in_flight: int = 1, **limits) -> RenderScheduler:
+    return RenderScheduler(
+        max_in_flight=max_in_flight,
+        tenant_max_in_flight=tenant_max_in_flight,
+        weights={RenderPriority.interactive: 4.0, RenderPriority.batch: 1.0},
+        **limits,
+    )
+
+
+async def run_jobs(
+    scheduler: RenderScheduler, jobs: list[tuple[str, RenderPriority]]
+) -> tuple[list[str], dict[str, int]]:
+    order: list[str] = []
+    positions: dict[str, int] = {}
+    gate = asyncio.Event()
+
+    async def job(name: str, tenant_id: str, priority: RenderPriority) -> None:
+        async with scheduler.reserve(tenant_id, priority) as ticket:
+            positions[name] = ticket.queue_position
+            await gate.wait()
+            order.append(name)
+
+    # 占住唯一名额，使后续任务全部进入队列
+    blocker = asyncio.create_task(job("blocker", "blocker", RenderPriority.batch))
+    await asyncio.sleep(0)
+    tasks = []
+    for index, (tenant_id, priority) in enumerate(jobs):
+        tasks.append(asyncio.create_task(job(f"{tenant_id}-{index}", tenant_id, priority)))
+        await asyncio.sleep(0)
+    gate.set()
+    await asyncio.gather(blocker, *tasks)
+    return order[1:], positions
+
+
+def test_tenants_share_capacity_round_robin() -> None:
+    scheduler = make_scheduler()
+    jobs = [("heavy", RenderPriority.batch)] * 3 + [("light", RenderPriority.batch)]
+
+    order, _ = asyncio.run(run_jobs(scheduler, jobs))
+
+    assert order.index("light-3") == 1
+
+
+def test_interactive_jumps_ahead_of_batch_backlog() -> None:
+    scheduler = make_scheduler()
+    jobs = [("heavy", RenderPriority.batch)] * 4 + [("light", RenderPriority.interactive)]
+
+    order, _ = asyncio.run(run_jobs(scheduler, jobs))
+
+    assert order[0] == "light-4"
+
+
+def test_tenant_in_flight_cap_leaves_room_for_others() -> None:
+    async def scenario() -> list[str]:
+        scheduler = make_scheduler(max_in_flight=2, tenant_max_in_flight=1)
+        started: list[str] = []
+        gate = asyncio.Event()
+
+        async def job(name: str, tenant_id: str) -> None:
+            async with scheduler.reserve(tenant_id):
+                started.append(name)
+                await gate.wait()
+
+        tasks = [
+            asyncio.create_task(job("heavy-0", "heavy")),
+            asyncio.create_task(job("heavy-1", "heavy")),
+            asyncio.create_task(job("light-0", "light")),
+        ]
+        await asyncio.sleep(0)
+        snapshot = list(started)
+        gate.set()
+        await asyncio.gather(*tasks)
+        assert scheduler.in_flight == 0
+        return snapshot
+
+    assert asyncio.run(scenario()) == ["heavy-0", "light-0"]
+
+
+def test_queue_position_reported() -> None:
+    scheduler = make_scheduler()
+    jobs = [("a", RenderPriority.batch), ("b", RenderPriority.batch), ("c", RenderPriority.interactive)]
+
+    _, positions = asyncio.run(run_jobs(scheduler, jobs))
+
+    assert positions == {"blocker": 0, "a-0": 0, "b-1": 1, "c-2": 0}
+
+
+def test_cancelled_waiter_releases_queue_slot() -> None:
+    async def scenario() -> RenderScheduler:
+        scheduler = make_scheduler()
+        gate = asyncio.Event()
+
+        async def job(tenant_id: str) -> None:
+            async with scheduler.reserve(tenant_id):
+                await gate.wait()
+
+        running = asyncio.create_task(job("a"))
+        waiting = asyncio.create_task(job("b"))
+        await asyncio.sleep(0)
+        assert scheduler.queued == 1
+        waiting.cancel()
+        await asyncio.gather(waiting, return_exceptions=True)
+        assert scheduler.queued == 0
+        gate.set()
+        await running
+        return scheduler
+
+    scheduler = asyncio.run(scenario())
+    assert scheduler.in_flight == 0
+
+
+def test_held_ticket_keeps_slot_until_render_completes() -> None:
+    async def scenario() -> None:
+        scheduler = make_scheduler()
+        rendered = asyncio.Event()
+
+        async with scheduler.reserve("a", RenderPriority.batch) as ticket:
+            ticket.hold_until(rendered.wait)
+        assert scheduler.in_flight == 1
+
+        async def next_render() -> RenderTicket:
+            async with scheduler.reserve("b", RenderPriority.batch) as next_ticket:
+                return next_ticket
+
+        waiting = asyncio.create_task(next_render())
+        await asyncio.sleep(0)
+        assert scheduler.queued == 1
+
+        rendered.set()
+        ticket_b = await waiting
+        assert ticket_b.queue_position == 0
+        assert ticket_b.wait_seconds > 0
+        assert scheduler.queued == 0
+        assert scheduler.in_flight == 0
+
+    asyncio.run(scenario())
+
+
+def test_failed_submission_releases_held_ticket() -> None:
+    async def scenario() -> int:
+        scheduler = make_scheduler()
+        try:
+            async with scheduler.reserve("a", RenderPriority.batch) as ticket:
+                ticket.hold_until(asyncio.Event().wait)
+                raise RuntimeError("submission failed")
+        except RuntimeError:
+            pass
+        return scheduler.in_flight
+
+    assert asyncio.run(scenario()) == 0
+
+
+def test_each_comfyui_server_gets_its_own_scheduler() -> None:
+    first = get_render_scheduler("http://comfy-a.test/")
+    assert get_render_scheduler("http://comfy-a.test") is first
+    assert get_render_scheduler("http://comfy-b.test") is not first
+
+
+def test_waiting_too_long_is_rejected_with_position() -> None:
+    async def scenario() -> RenderQueueError:
+        scheduler = make_scheduler(max_queue_wait=0.01)
+        gate = asyncio.Event()
+
+        async def hold() -> None:
+            async with scheduler.reserve("a"):
+                await gate.wait()
+
+        holder = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        try:
+            async with scheduler.reserve("b"):
+                pass
+        except RenderQueueError as exc:
+            error = exc
+        assert scheduler.queued == 0
+        gate.set()
+        await holder
+        assert scheduler.in_flight == 0
+        return error
+
+    error = asyncio.run(scenario())
+    assert error.status_code == 503
+    assert error.queue_position == 0
+
+
+def test_tenant_queue_depth_is_capped() -> None:
+    async def scenario() -> RenderQueueError:
+        scheduler = make_scheduler(tenant_max_queued=1)
+        gate = asyncio.Event()
+
+        async def hold() -> None:
+            async with scheduler.reserve("a"):
+                await gate.wait()
+
+        tasks = [asyncio.create_task(hold()), asyncio.create_task(hold())]
+        await asyncio.sleep(0)
+        try:
+            async with scheduler.reserve("a"):
+                pass
+        except RenderQueueError as exc:
+            error = exc
+        gate.set()
+        await asyncio.gather(*tasks)
+        return error
+
+    assert asyncio.run(scenario()).status_code == 429
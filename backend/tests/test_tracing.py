@@ -0,0 +1,109 @@
+"""Tests for request tracing and structured logging."""
+
+import json
+import logging
+from logging.handlers import QueueHandler
+
+import pytest
+from fastapi.testclient import TestClient
+from pydantic import ValidationError
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from backend.app.core import tracing
+from backend.app.core.config import AppSettings
+from backend.app.core.logging import ContextQueueHandler, JsonFormatter, configure_logging, shutdown_logging
+from backend.app.main import app
+
+client = TestClient(app)
+
+
+def test_request_id_is_echoed() -> None:
+    response = client.get("/api/v1/health", headers={tracing.REQUEST_ID_HEADER: "req_test"})
+    assert response.headers[tracing.REQUEST_ID_HEADER] == "req_test"
+
+
+def test_request_id_is_generated_when_missing() -> None:
+    response = client.get("/api/v1/health")
+    assert response.headers[tracing.REQUEST_ID_HEADER].startswith("req_")
+
+
+def test_invalid_request_id_is_replaced() -> None:
+    response = client.get("/api/v1/health", headers={tracing.REQUEST_ID_HEADER: "x" * 65})
+    assert response.headers[tracing.REQUEST_ID_HEADER].startswith("req_")
+
+    response = client.get("/api/v1/health", headers={tracing.REQUEST_ID_HEADER: "bad id;<script>"})
+    assert response.headers[tracing.REQUEST_ID_HEADER].startswith("req_")
+
+
+def test_span_is_noop_when_not_sampled() -> None:
+    assert tracing.span("stage") is tracing.span("other")
+
+
+def test_sampled_span_records_duration(caplog) -> None:
+    token = tracing._sampled.set(True)
+    try:
+        with caplog.at_level(logging.INFO, logger="app.trace"):
+            with tracing.span("stage", job_id="job_1") as stage:
+                stage.set(bytes=3)
+    finally:
+        tracing._sampled.reset(token)
+
+    record = caplog.records[-1]
+    assert record.span == "stage"
+    assert record.duration_ms >= 0
+    assert record.span_attributes == {"job_id": "job_1", "bytes": 3}
+
+
+def test_span_is_noop_when_info_logging_disabled() -> None:
+    token = tracing._sampled.set(True)
+    trace_logger = logging.getLogger("app.trace")
+    trace_logger.setLevel(logging.WARNING)
+    try:
+        assert tracing.span("stage") is tracing.span("other")
+    finally:
+        trace_logger.setLevel(logging.NOTSET)
+        tracing._sampled.reset(token)
+
+
+def test_queued_record_carries_request_id_as_json() -> None:
+    token = tracing._request_id.set("req_abc")
+    try:
+        record = logging.LogRecord("app", logging.INFO, __file__, 1, "hello %s", ("world",), None)
+        prepared = ContextQueueHandler(None).prepare(record)
+    finally:
+        tracing._request_id.reset(token)
+
+    payload = json.loads(JsonFormatter().format(prepared))
+    assert payload["message"] == "hello world"
+    assert payload["request_id"] == "req_abc"
+
+
+def test_shutdown_falls_back_to_direct_handler() -> None:
+    shutdown_logging()
+    try:
+        handlers = logging.getLogger().handlers
+        assert handlers and not any(isinstance(handler, QueueHandler) for handler in handlers)
+    finally:
+        configure_logging()
+
+
+def test_uvicorn_loggers_route_through_queue() -> None:
+    access = logging.getLogger("uvicorn.access")
+    access.addHandler(logging.StreamHandler())
+    access.propagate = False
+
+    configure_logging()
+
+    assert access.handlers == []
+    assert access.propagate
+
+
+def test_unknown_log_level_is_rejected() -> None:
+    with pytest.raises(ValidationError):
+        AppSettings(log_level="verbose")
+    assert AppSettings(log_level="debug").log_level == "DEBUG"
+
+
+def test_tracing_middleware_is_plain_asgi() -> None:
+    assert tracing.RequestTracingMiddleware in [middleware.cls for middleware in app.user_middleware]
+    assert BaseHTTPMiddleware not in [middleware.cls for middleware in app.user_middleware]